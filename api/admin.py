@@ -7,6 +7,7 @@ class CategoryAdmin(admin.ModelAdmin):
     list_display = ('id', 'name', 'user', 'type', 'budget')
     list_filter = ('type', 'user')
     search_fields = ('name', 'user__email')
+    list_select_related = ('user',)
 
 
 @admin.register(Transaction)
@@ -14,6 +15,7 @@ class TransactionAdmin(admin.ModelAdmin):
     list_display = ('id', 'description', 'user', 'category', 'amount', 'type', 'date')
     list_filter = ('type', 'date', 'user')
     search_fields = ('description', 'user__email')
+    list_select_related = ('user', 'category')
 
 
 @admin.register(UserProfile)
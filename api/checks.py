@@ -0,0 +1,21 @@
+# api/checks.py
+from django.conf import settings
+from django.core.checks import Warning, register, Tags
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """
+    Cached aggregates are invalidated by signals in the worker that handled
+    the write; with a per-process cache the other workers serve stale data.
+    """
+    backend = settings.CACHES['default']['BACKEND']
+    if backend.endswith('LocMemCache'):
+        return [
+            Warning(
+                "The default cache is per-process LocMemCache.",
+                hint="Set REDIS_URL so all workers share one cache.",
+                id='api.W001',
+            )
+        ]
+    return []
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from api.models import UserProfile
+
+
+class Command(BaseCommand):
+    help = "Rebuild UserProfile lifetime income/expense totals from transactions."
+
+    def handle(self, *args, **options):
+        count = 0
+        for profile in UserProfile.objects.only('id', 'user_id').iterator():
+            profile.recompute_lifetime_totals()
+            count += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Recomputed totals for {count} profile(s)."))
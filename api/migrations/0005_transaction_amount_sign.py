@@ -0,0 +1,31 @@
+# Generated by Django 5.2.9 on 2026-10-15 16:40
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def normalize_amount_signs(apps, schema_editor):
+    """
+    Flip rows written before the sign rule was enforced so the
+    constraint can be added.
+    """
+    Transaction = apps.get_model('api', 'Transaction')
+    Transaction.objects.filter(type='income', amount__lt=0).update(amount=-F('amount'))
+    Transaction.objects.filter(type='expense', amount__gt=0).update(amount=-F('amount'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_transaction_amount_cents'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_amount_signs, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='transaction',
+            constraint=models.CheckConstraint(condition=models.Q(models.Q(('amount__gte', 0), ('type', 'income')), models.Q(('amount__lte', 0), ('type', 'expense')), _connector='OR'), name='tx_amount_sign'),
+        ),
+    ]
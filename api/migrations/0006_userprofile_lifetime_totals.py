@@ -0,0 +1,38 @@
+# Generated by Django 5.2.9 on 2026-10-15 16:41
+
+from django.db import migrations, models
+from django.db.models import Q, Sum
+
+
+def backfill_lifetime_totals(apps, schema_editor):
+    Transaction = apps.get_model('api', 'Transaction')
+    UserProfile = apps.get_model('api', 'UserProfile')
+    for profile in UserProfile.objects.all():
+        totals = Transaction.objects.filter(user_id=profile.user_id).aggregate(
+            income=Sum('amount_cents', filter=Q(type='income'), default=0),
+            expense=Sum('amount_cents', filter=Q(type='expense'), default=0),
+        )
+        profile.lifetime_income_cents = totals['income']
+        profile.lifetime_expense_cents = -totals['expense']
+        profile.save(update_fields=['lifetime_income_cents', 'lifetime_expense_cents'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_transaction_amount_sign'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='lifetime_expense_cents',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='lifetime_income_cents',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_lifetime_totals, migrations.RunPython.noop),
+    ]
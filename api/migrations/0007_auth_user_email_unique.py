@@ -0,0 +1,44 @@
+from django.db import migrations
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+
+def check_duplicate_emails(apps, schema_editor):
+    """
+    Fail with the offending addresses instead of a bare index error. The
+    accounts have to be merged or renamed by hand before migrating.
+    """
+    User = apps.get_model('auth', 'User')
+    duplicates = list(
+        User.objects.exclude(email='')
+        .values(lower_email=Lower('email'))
+        .annotate(n=Count('id'))
+        .filter(n__gt=1)
+        .values_list('lower_email', flat=True)
+    )
+    if duplicates:
+        raise RuntimeError(
+            "Cannot add the case-insensitive email index; these emails are "
+            "used by more than one account: " + ", ".join(sorted(duplicates))
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_userprofile_lifetime_totals'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicate_emails, migrations.RunPython.noop),
+        # Case-insensitive uniqueness for signup emails; blank emails
+        # (e.g. superusers created without one) are left alone.
+        migrations.RunSQL(
+            sql=(
+                "CREATE UNIQUE INDEX auth_user_email_uniq "
+                "ON auth_user (LOWER(email)) WHERE email <> ''"
+            ),
+            reverse_sql="DROP INDEX auth_user_email_uniq",
+        ),
+    ]
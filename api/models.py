@@ -1,14 +1,24 @@
 # api/models.py
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
+from django.db.models.functions import Cast, Lower, Round
 from django.contrib.auth.models import User
 
 
-class Category(models.Model):
-    TYPE_CHOICES = (
-        ('income', 'Income'),
-        ('expense', 'Expense'),
-    )
+class UserScopedQuerySet(models.QuerySet):
+    def for_user(self, user):
+        """
+        Rows owned by `user` (a User instance or id).
+        """
+        return self.filter(user=user)
+
+
+class TxType(models.TextChoices):
+    INCOME = 'income', 'Income'
+    EXPENSE = 'expense', 'Expense'
 
+
+class Category(models.Model):
     user = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -17,24 +27,27 @@ class Category(models.Model):
     name = models.CharField(max_length=100)
     color = models.CharField(max_length=7, default="#3b82f6")  # hex color
     icon = models.CharField(max_length=50, default="ShoppingCart")
-    type = models.CharField(max_length=7, choices=TYPE_CHOICES, default='expense')
+    type = models.CharField(max_length=7, choices=TxType.choices, default=TxType.EXPENSE)
     budget = models.DecimalField(max_digits=10, decimal_places=2, default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = UserScopedQuerySet.as_manager()
+
     class Meta:
-        unique_together = ('user', 'name')  # each user can't have two "Food" categories
+        constraints = [
+            # each user can't have two "Food" categories
+            models.UniqueConstraint(fields=['user', 'name'], name='uniq_category_user_name'),
+        ]
+        indexes = [
+            models.Index(Lower('name'), 'user', name='category_user_lower_name_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.user.email})"
 
 
 class Transaction(models.Model):
-    TYPE_CHOICES = (
-        ('income', 'Income'),
-        ('expense', 'Expense'),
-    )
-
     user = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -49,13 +62,48 @@ class Transaction(models.Model):
     )
     description = models.CharField(max_length=200)
     amount = models.DecimalField(max_digits=10, decimal_places=2)
-    type = models.CharField(max_length=7, choices=TYPE_CHOICES)
+    # amount in integer cents, kept in sync by the database; used for SUMs
+    amount_cents = models.GeneratedField(
+        expression=Cast(Round(F('amount') * 100), models.BigIntegerField()),
+        output_field=models.BigIntegerField(),
+        db_persist=True,
+    )
+    type = models.CharField(max_length=7, choices=TxType.choices)
     date = models.DateField()
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = UserScopedQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # amount_cents as a trailing key lets the SUMs run as index-only scans
+            models.Index(fields=['user', 'type', 'date', 'amount_cents'], name='tx_user_type_date_amt_idx'),
+            models.Index(fields=['user', 'category', 'type'], name='tx_user_cat_type_idx'),
+            # matches the list ordering (-date, -id)
+            models.Index(fields=['user', '-date', '-id'], name='tx_user_date_id_desc_idx'),
+        ]
+        constraints = [
+            # income is stored positive, expenses negative; this also rejects
+            # any type outside TxType
+            models.CheckConstraint(
+                condition=(
+                    models.Q(type=TxType.INCOME, amount__gte=0)
+                    | models.Q(type=TxType.EXPENSE, amount__lte=0)
+                ),
+                name='tx_amount_sign',
+            ),
+        ]
+
     def __str__(self):
         return f"{self.description} - {self.amount} ({self.type})"
 
+    def save(self, *args, **kwargs):
+        # api.signals locks the old row in pre_save and moves the profile
+        # totals in post_save; both must commit or roll back with the write.
+        # (Deletes already run their signals inside the collector's atomic.)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
 
 class UserProfile(models.Model):
     CURRENCY_CHOICES = (
@@ -73,6 +121,24 @@ class UserProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile')
     currency = models.CharField(max_length=10, choices=CURRENCY_CHOICES, default='USD')
     date_format = models.CharField(max_length=20, choices=DATE_FORMAT_CHOICES, default='YYYY-MM-DD')
+    # running totals kept up to date by api.signals; expenses as a positive number
+    lifetime_income_cents = models.BigIntegerField(default=0)
+    lifetime_expense_cents = models.BigIntegerField(default=0)
 
     def __str__(self):
         return f"Profile for {self.user.email}"
+
+    def recompute_lifetime_totals(self):
+        """
+        Rebuild the running totals from the user's transactions.
+        """
+        totals = Transaction.objects.for_user(self.user_id).aggregate(
+            income=models.Sum('amount_cents', filter=models.Q(type=TxType.INCOME), default=0),
+            expense=models.Sum('amount_cents', filter=models.Q(type=TxType.EXPENSE), default=0),
+        )
+        self.lifetime_income_cents = totals['income']
+        self.lifetime_expense_cents = -totals['expense']
+        UserProfile.objects.filter(pk=self.pk).update(
+            lifetime_income_cents=self.lifetime_income_cents,
+            lifetime_expense_cents=self.lifetime_expense_cents,
+        )
@@ -0,0 +1,23 @@
+# api/renderers.py
+import orjson
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class ORJSONRenderer(BaseRenderer):
+    """
+    JSON renderer backed by orjson. Types orjson doesn't know (Decimal, lazy
+    strings, ...) fall back to DRF's encoder; non-str dict keys are
+    stringified and UTC datetimes end in 'Z', as with JSONRenderer.
+    """
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+
+    _default = staticmethod(JSONEncoder().default)
+    _options = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return orjson.dumps(data, default=self._default, option=self._options)
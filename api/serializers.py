@@ -1,10 +1,8 @@
 # api/serializers.py
-from decimal import Decimal
-from django.db.models import Sum, F
-from django.db.models.functions import Abs
+from django.db.models import Sum
 from rest_framework import serializers
 from django.contrib.auth.models import User
-from .models import Category, Transaction, UserProfile
+from .models import Category, Transaction, TxType, UserProfile
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -24,32 +22,51 @@ class CategorySerializer(serializers.ModelSerializer):
         model = Category
         fields = ['id', 'name', 'color', 'icon', 'type', 'budget', 'count', 'spent']
 
+    def to_representation(self, instance):
+        # Resolve the requesting user once per serializer, not per field/row
+        if not hasattr(self, '_request_user'):
+            request = self.context.get('request')
+            self._request_user = (
+                request.user if request and request.user.is_authenticated else None
+            )
+        return super().to_representation(instance)
+
     def get_count(self, obj):
         """
         Number of transactions in this category for the current user.
+        Uses the `_count` annotation from the list view when present.
         """
-        request = self.context.get('request')
-        if not request or not request.user.is_authenticated:
+        if hasattr(obj, '_count'):
+            return obj._count
+        if obj.pk is None:
+            return 0
+
+        if self._request_user is None:
             return 0
 
-        return obj.transactions.filter(user=request.user).count()
+        return obj.transactions.for_user(self._request_user).count()
 
     def get_spent(self, obj):
         """
-        Total spent in this category (sum of ABS(expense amounts)) for current user.
+        Total spent in this category for current user. Expenses are stored
+        negative, so this is the negated sum of expense amounts (in cents).
+        Uses the `_spent_cents` annotation from the list view when present.
         """
-        request = self.context.get('request')
-        if not request or not request.user.is_authenticated:
+        if hasattr(obj, '_spent_cents'):
+            return -obj._spent_cents / 100 if obj._spent_cents else 0.0
+        if obj.pk is None:
+            return 0.0
+
+        if self._request_user is None:
             return 0.0
 
-        total = obj.transactions.filter(
-            user=request.user,
-            type='expense',
+        total = obj.transactions.for_user(self._request_user).filter(
+            type=TxType.EXPENSE,
         ).aggregate(
-            total=Sum(Abs(F('amount')))
-        )['total'] or Decimal('0')
+            total=Sum('amount_cents')
+        )['total']
 
-        return float(total)
+        return -total / 100 if total else 0.0
 
 class TransactionSerializer(serializers.ModelSerializer):
     category_name = serializers.CharField(source='category.name', read_only=True)
@@ -67,20 +84,48 @@ class TransactionSerializer(serializers.ModelSerializer):
         ]
 
     def validate(self, attrs):
-        t_type = attrs.get('type')
-        amount = attrs.get('amount')
+        # On partial updates fall back to the stored values
+        t_type = attrs.get('type', getattr(self.instance, 'type', None))
+        amount = attrs.get('amount', getattr(self.instance, 'amount', None))
+        if t_type is None or amount is None:
+            return attrs
 
-        # Ensure amount sign is consistent:
+        # Ensure amount sign is consistent (enforced by tx_amount_sign):
         # - income: positive
         # - expense: negative
-        if t_type == 'income' and amount < 0:
-            attrs['amount'] = abs(amount)
-        if t_type == 'expense' and amount > 0:
-            attrs['amount'] = -abs(amount)
+        if t_type == TxType.INCOME and amount < 0:
+            attrs['amount'] = -amount
+        elif t_type == TxType.EXPENSE and amount > 0:
+            attrs['amount'] = -amount
 
         return attrs
 
 
+# Columns read by transaction_rows()
+TRANSACTION_ROW_FIELDS = (
+    'id', 'description', 'amount', 'category_id', 'category__name', 'type', 'date',
+)
+
+
+def transaction_rows(rows):
+    """
+    Read-only fast path for TransactionSerializer: turns `.values(*TRANSACTION_ROW_FIELDS)`
+    rows into the same output without per-field serializer overhead.
+    """
+    return [
+        {
+            'id': row['id'],
+            'description': row['description'],
+            'amount': str(row['amount']),
+            'category': row['category_id'],
+            'category_name': row['category__name'],
+            'type': row['type'],
+            'date': row['date'].isoformat(),
+        }
+        for row in rows
+    ]
+
+
 class UserProfileSerializer(serializers.ModelSerializer):
     class Meta:
         model = UserProfile
@@ -106,18 +151,27 @@ class ProfileUpdateSerializer(serializers.Serializer):
         currency = validated_data.get('currency')
         date_format = validated_data.get('date_format')
 
+        # Only write the columns that were actually sent
+        user_fields = []
         if name is not None:
             user.first_name = name
+            user_fields.append('first_name')
         if email is not None:
             user.email = email
             user.username = email  # keep username == email if you're using that pattern
-        user.save()
+            user_fields += ['email', 'username']
+        if user_fields:
+            user.save(update_fields=user_fields)
 
+        profile_fields = []
         if currency is not None:
             profile.currency = currency
+            profile_fields.append('currency')
         if date_format is not None:
             profile.date_format = date_format
-        profile.save()
+            profile_fields.append('date_format')
+        if profile_fields:
+            profile.save(update_fields=profile_fields)
 
         return {'user': user, 'profile': profile}
 
@@ -0,0 +1,91 @@
+# api/signals.py
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db.models import F
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from .models import Category, Transaction, TxType, UserProfile
+
+
+def category_aggregates_cache_key(user_id):
+    return f"catagg:{user_id}"
+
+
+def dashboard_cache_key(user_id):
+    return f"dashboard:{user_id}"
+
+
+def analytics_cache_key(user_id):
+    return f"analytics:{user_id}"
+
+
+def token_cache_key(user_id):
+    return f"tok:{user_id}"
+
+
+@receiver([post_save, post_delete], sender=Transaction)
+@receiver([post_save, post_delete], sender=Category)
+def invalidate_user_caches(sender, instance, **kwargs):
+    """
+    Drop the cached category aggregates, dashboard summary and analytics
+    overview for the owner of a changed row.
+    """
+    cache.delete_many([
+        category_aggregates_cache_key(instance.user_id),
+        dashboard_cache_key(instance.user_id),
+        analytics_cache_key(instance.user_id),
+    ])
+
+
+def _adjust_lifetime_totals(user_id, t_type, amount, sign=1):
+    cents = int(Decimal(str(amount)) * 100) * sign
+    if not cents:
+        return
+    if t_type == TxType.INCOME:
+        UserProfile.objects.filter(user_id=user_id).update(
+            lifetime_income_cents=F('lifetime_income_cents') + cents
+        )
+    else:
+        # expenses are stored negative, the profile keeps them positive
+        UserProfile.objects.filter(user_id=user_id).update(
+            lifetime_expense_cents=F('lifetime_expense_cents') - cents
+        )
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_token_cache(sender, instance, **kwargs):
+    """
+    Forget the cached login token once it is revoked or rotated.
+    """
+    cache.delete(token_cache_key(instance.user_id))
+
+
+@receiver(pre_save, sender=Transaction)
+def remember_previous_transaction(sender, instance, **kwargs):
+    """
+    Keep the stored (user, type, amount) so post_save can reverse it. The row
+    is locked so concurrent updates can't both reverse the same old amount.
+    """
+    instance._previous = None
+    if instance.pk and not instance._state.adding:
+        instance._previous = Transaction.objects.select_for_update().filter(
+            pk=instance.pk
+        ).values_list(
+            'user_id', 'type', 'amount'
+        ).first()
+
+
+@receiver(post_save, sender=Transaction)
+def update_lifetime_totals_on_save(sender, instance, **kwargs):
+    previous = getattr(instance, '_previous', None)
+    if previous is not None:
+        _adjust_lifetime_totals(*previous, sign=-1)
+    _adjust_lifetime_totals(instance.user_id, instance.type, instance.amount)
+
+
+@receiver(post_delete, sender=Transaction)
+def update_lifetime_totals_on_delete(sender, instance, **kwargs):
+    _adjust_lifetime_totals(instance.user_id, instance.type, instance.amount, sign=-1)
@@ -1,13 +1,14 @@
 # api/views.py
-from decimal import Decimal
+from base64 import urlsafe_b64decode, urlsafe_b64encode
 from datetime import date
-from collections import defaultdict
 
+from django.conf import settings
 from django.contrib.auth.models import User
 from django.contrib.auth import authenticate
 from django.contrib.auth.password_validation import validate_password
-from django.db.models import Sum, F
-from django.db import models
+from django.db.models import Count, Sum, Q
+from django.db import models, transaction, IntegrityError
+from django.core.cache import cache
 
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
@@ -15,9 +16,18 @@ from rest_framework.response import Response
 from rest_framework import status, generics
 from rest_framework.views import APIView
 from rest_framework.authtoken.models import Token
-from django.db.models.functions import Abs
-
-from .models import Category, Transaction, UserProfile
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.utils.urls import replace_query_param
+from django.db.models.functions import ExtractMonth, ExtractYear
+
+from .models import Category, Transaction, TxType, UserProfile
+from .signals import (
+    analytics_cache_key,
+    category_aggregates_cache_key,
+    dashboard_cache_key,
+    token_cache_key,
+)
 from .serializers import (
     UserSerializer,
     CategorySerializer,
@@ -25,9 +35,15 @@ from .serializers import (
     UserProfileSerializer,
     ProfileUpdateSerializer,
     PasswordChangeSerializer,
+    TRANSACTION_ROW_FIELDS,
+    transaction_rows,
 )
 
 
+# Chart labels indexed by month number - 1
+MONTHS = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+
+
 # ---------- Simple hello (from earlier) ----------
 
 @api_view(['GET'])
@@ -55,24 +71,26 @@ def signup_view(request):
             status=status.HTTP_400_BAD_REQUEST
         )
 
-    if User.objects.filter(email=email).exists():
+    # Rely on the unique username/email indexes instead of a pre-check
+    try:
+        with transaction.atomic():
+            user = User.objects.create_user(
+                username=email,
+                email=email,
+                password=password,
+                first_name=name
+            )
+
+            # Create profile with defaults
+            UserProfile.objects.create(user=user)
+
+            token = Token.objects.create(user=user)
+    except IntegrityError:
         return Response(
             {"error": "Email is already registered."},
             status=status.HTTP_400_BAD_REQUEST
         )
 
-    user = User.objects.create_user(
-        username=email,
-        email=email,
-        password=password,
-        first_name=name
-    )
-
-    # Create profile with defaults
-    UserProfile.objects.create(user=user)
-
-    token, _ = Token.objects.get_or_create(user=user)
-
     return Response(
         {
             "token": token.key,
@@ -106,11 +124,25 @@ def login_view(request):
             status=status.HTTP_400_BAD_REQUEST
         )
 
-    token, _ = Token.objects.get_or_create(user=user)
+    # Repeat logins read the key from cache; signals drop it when the
+    # token is deleted. Disabled (timeout 0) unless the cache is shared, or
+    # other workers would keep handing out a rotated key.
+    # Signup creates the token, so a plain lookup is the common case on a
+    # miss; get_or_create covers concurrent first logins.
+    timeout = settings.TOKEN_CACHE_TIMEOUT
+    cache_key = token_cache_key(user.id)
+    token_key = cache.get(cache_key) if timeout else None
+    if token_key is None:
+        try:
+            token_key = Token.objects.only('key').get(user_id=user.id).key
+        except Token.DoesNotExist:
+            token_key = Token.objects.get_or_create(user=user)[0].key
+        if timeout:
+            cache.set(cache_key, token_key, timeout)
 
     return Response(
         {
-            "token": token.key,
+            "token": token_key,
             "user": {
                 "id": user.id,
                 "name": user.first_name,
@@ -141,12 +173,25 @@ def forgot_password_view(request):
 
 # ---------- Me / profile ----------
 
+def get_profile(user):
+    """
+    Profile for `user`. Signup always creates one, so the create is only a
+    fallback for older accounts and avoids get_or_create's savepoint. Those
+    accounts may already have transactions, so their totals are rebuilt.
+    """
+    profile = UserProfile.objects.filter(user=user).first()
+    if profile is None:
+        profile = UserProfile.objects.create(user=user)
+        profile.recompute_lifetime_totals()
+    return profile
+
+
 class MeView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
         user = request.user
-        profile, _ = UserProfile.objects.get_or_create(user=user)
+        profile = get_profile(user)
         return Response({
             "user": UserSerializer(user).data,
             "profile": UserProfileSerializer(profile).data,
@@ -158,7 +203,7 @@ class ProfileView(APIView):
 
     def get(self, request):
         user = request.user
-        profile, _ = UserProfile.objects.get_or_create(user=user)
+        profile = get_profile(user)
         return Response({
             "user": UserSerializer(user).data,
             "profile": UserProfileSerializer(profile).data,
@@ -166,12 +211,22 @@ class ProfileView(APIView):
 
     def put(self, request):
         user = request.user
-        profile, _ = UserProfile.objects.get_or_create(user=user)
+        profile = get_profile(user)
         serializer = ProfileUpdateSerializer(
             data=request.data
         )
         serializer.is_valid(raise_exception=True)
-        updated = serializer.update({'user': user, 'profile': profile}, serializer.validated_data)
+        try:
+            with transaction.atomic():
+                updated = serializer.update(
+                    {'user': user, 'profile': profile}, serializer.validated_data
+                )
+        except IntegrityError:
+            # auth_user_email_uniq: the email belongs to another account
+            return Response(
+                {"error": "Email is already registered."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
         return Response({
             "user": UserSerializer(updated['user']).data,
@@ -205,10 +260,19 @@ class ChangePasswordView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        user.set_password(new_password)
-        user.save()
+        with transaction.atomic():
+            user.set_password(new_password)
+            user.save(update_fields=['password'])
 
-        return Response({"message": "Password changed successfully."})
+            # Rotate the token so other sessions are signed out; deleting
+            # the old one also clears it from the login cache.
+            Token.objects.filter(user=user).delete()
+            token = Token.objects.create(user=user)
+
+        return Response({
+            "message": "Password changed successfully.",
+            "token": token.key,
+        })
 
 
 # ---------- Category CRUD ----------
@@ -217,11 +281,48 @@ class CategoryListCreateView(generics.ListCreateAPIView):
     serializer_class = CategorySerializer
     permission_classes = [IsAuthenticated]
 
+    # Seconds to keep per-category count/spent; signals bust it on writes.
+    aggregates_cache_timeout = 60
+
     def get_queryset(self):
-        return Category.objects.filter(user=self.request.user).order_by('name')
+        return Category.objects.for_user(self.request.user).only(
+            'id', 'name', 'color', 'icon', 'type', 'budget', 'user',
+        ).order_by('name')
+
+    def list(self, request, *args, **kwargs):
+        user = request.user
+        key = category_aggregates_cache_key(user.id)
+        aggregates = cache.get(key)
+
+        if aggregates is None:
+            # Annotate count/spent here so the serializer doesn't run
+            # two aggregate queries per category.
+            categories = list(self.get_queryset().annotate(
+                _count=Count('transactions', filter=Q(transactions__user=user)),
+                _spent_cents=Sum(
+                    'transactions__amount_cents',
+                    filter=Q(transactions__user=user, transactions__type=TxType.EXPENSE),
+                    default=0,
+                ),
+            ))
+            cache.set(
+                key,
+                {c.id: (c._count, c._spent_cents) for c in categories},
+                self.aggregates_cache_timeout,
+            )
+        else:
+            categories = list(self.get_queryset())
+            for c in categories:
+                c._count, c._spent_cents = aggregates.get(c.id, (0, 0))
+
+        serializer = self.get_serializer(categories, many=True)
+        return Response(serializer.data)
 
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        category = serializer.save(user=self.request.user)
+        # A brand-new category can't have transactions yet
+        category._count = 0
+        category._spent_cents = 0
 
 
 class CategoryDetailView(generics.RetrieveUpdateDestroyAPIView):
@@ -229,24 +330,106 @@ class CategoryDetailView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return Category.objects.filter(user=self.request.user)
+        return Category.objects.for_user(self.request.user)
 
 
 # ---------- Transaction CRUD ----------
 
+class TransactionCursorPagination(BasePagination):
+    """
+    Keyset pagination on (date, id), newest first. The cursor carries the
+    (date, id) of the edge row, so each page is a range scan on
+    tx_user_date_id_desc_idx however deep the client pages. DRF's
+    CursorPagination keys on `date` alone plus an offset, which degrades
+    with many same-day rows.
+
+    Pages are rows from `.values()` and must include 'id' and 'date'.
+    """
+    page_size = 50
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.base_url = request.build_absolute_uri()
+        cursor = self.decode_cursor(request)
+
+        if cursor is None:
+            reverse = False
+            queryset = queryset.order_by('-date', '-id')
+        else:
+            reverse, c_date, c_id = cursor
+            # date bound first so the index range is used, then the tie-break
+            if reverse:
+                # rows newer than the cursor, read oldest-first then flipped
+                queryset = queryset.filter(date__gte=c_date).filter(
+                    Q(date__gt=c_date) | Q(id__gt=c_id)
+                ).order_by('date', 'id')
+            else:
+                queryset = queryset.filter(date__lte=c_date).filter(
+                    Q(date__lt=c_date) | Q(id__lt=c_id)
+                ).order_by('-date', '-id')
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_next_link(self):
+        if not (self.has_next and self.page):
+            return None
+        return self.encode_cursor(False, self.page[-1])
+
+    def get_previous_link(self):
+        if not (self.has_previous and self.page):
+            return None
+        return self.encode_cursor(True, self.page[0])
+
+    def encode_cursor(self, reverse, row):
+        raw = f"{'p' if reverse else 'n'}|{row['date'].isoformat()}|{row['id']}"
+        encoded = urlsafe_b64encode(raw.encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            raw = urlsafe_b64decode(encoded.encode()).decode()
+            direction, c_date, c_id = raw.split('|')
+            if direction not in ('n', 'p'):
+                raise ValueError(direction)
+            return direction == 'p', date.fromisoformat(c_date), int(c_id)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+
 class TransactionListCreateView(generics.ListCreateAPIView):
     serializer_class = TransactionSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = TransactionCursorPagination
 
     def get_queryset(self):
-        qs = Transaction.objects.filter(user=self.request.user).order_by('-date', '-id')
+        # Ordering is applied by the paginator; list() projects the columns
+        qs = Transaction.objects.for_user(self.request.user)
 
         # Optional filters (type, category, search)
         t_type = self.request.query_params.get('type')
         category_id = self.request.query_params.get('category')
         search = self.request.query_params.get('search')
 
-        if t_type in ['income', 'expense']:
+        if t_type in TxType.values:
             qs = qs.filter(type=t_type)
         if category_id:
             qs = qs.filter(category_id=category_id)
@@ -255,6 +438,12 @@ class TransactionListCreateView(generics.ListCreateAPIView):
 
         return qs
 
+    def list(self, request, *args, **kwargs):
+        # Reads skip the ModelSerializer; it's only used to validate writes
+        qs = self.filter_queryset(self.get_queryset()).values(*TRANSACTION_ROW_FIELDS)
+        page = self.paginate_queryset(qs)
+        return self.get_paginated_response(transaction_rows(page))
+
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
@@ -264,7 +453,13 @@ class TransactionDetailView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return Transaction.objects.filter(user=self.request.user)
+        # 'user' stays loaded for the signals that run on save/delete
+        return Transaction.objects.for_user(self.request.user).select_related(
+            'category'
+        ).only(
+            'id', 'user', 'description', 'amount', 'category', 'type', 'date',
+            'category__name',
+        )
 
 
 # ---------- Dashboard summary ----------
@@ -272,53 +467,85 @@ class TransactionDetailView(generics.RetrieveUpdateDestroyAPIView):
 class DashboardSummaryView(APIView):
     permission_classes = [IsAuthenticated]
 
+    # Seconds to keep summary/chart; signals bust it on writes.
+    summary_cache_timeout = 60
+
     def get(self, request):
         user = request.user
 
-        qs = Transaction.objects.filter(user=user)
+        qs = Transaction.objects.for_user(user)
 
-        income_total = qs.filter(type='income').aggregate(
-            total=Sum('amount')
-        )['total'] or Decimal('0')
+        # Totals and chart only change when the user's data does
+        key = dashboard_cache_key(user.id)
+        summary = cache.get(key)
+        if summary is None:
+            summary = self.build_summary(user, qs)
+            cache.set(key, summary, self.summary_cache_timeout)
 
-        expense_total = qs.filter(type='expense').aggregate(
-            total=Sum('amount')
-        )['total'] or Decimal('0')
+        # Recent transactions
+        recent_qs = qs.values(*TRANSACTION_ROW_FIELDS).order_by('-date', '-id')[:5]
+        recent_transactions = transaction_rows(recent_qs)
 
-        # expense_total will be negative if we store negative numbers; use abs
-        expense_total_abs = abs(expense_total)
+        return Response({
+            **summary,
+            "recent_transactions": recent_transactions,
+        })
 
-        balance = income_total - expense_total_abs
+    def build_summary(self, user, qs):
+        # Running totals are kept on the profile; aggregate only if it's missing
+        profile = UserProfile.objects.filter(user=user).only(
+            'lifetime_income_cents', 'lifetime_expense_cents',
+        ).first()
+
+        if profile is not None:
+            income_cents = profile.lifetime_income_cents
+            expense_cents = profile.lifetime_expense_cents
+        else:
+            # Income and expense totals (in cents) in a single conditional aggregate
+            totals = qs.aggregate(
+                income=Sum('amount_cents', filter=Q(type=TxType.INCOME), default=0),
+                expense=Sum('amount_cents', filter=Q(type=TxType.EXPENSE), default=0),
+            )
+            income_cents = totals['income']
 
-        # Last 6 months chart (income vs expenses per month)
-        # We'll build it in python for simplicity
-        chart_data_dict = defaultdict(lambda: {'income': Decimal('0'), 'expenses': Decimal('0')})
+            # expenses are stored negative (tx_amount_sign)
+            expense_cents = -totals['expense']
 
-        for t in qs:
-            month_label = t.date.strftime('%b')  # Jan, Feb, etc.
-            if t.type == 'income':
-                chart_data_dict[month_label]['income'] += t.amount
+        balance_cents = income_cents - expense_cents
+
+        # Last 6 months chart (income vs expenses per month)
+        # Grouped in the database; Python only sees one row per month and type
+        monthly = qs.annotate(
+            y=ExtractYear('date'), mo=ExtractMonth('date'),
+        ).values('y', 'mo', 'type').annotate(
+            total_cents=Sum('amount_cents')
+        ).order_by('y', 'mo')
+
+        # month label -> [income cents, expense cents], in first-seen order
+        chart = {}
+        for row in monthly:
+            month_label = MONTHS[row['mo'] - 1]  # Jan, Feb, etc.
+            vals = chart.get(month_label)
+            if vals is None:
+                vals = chart[month_label] = [0, 0]
+            if row['type'] == TxType.INCOME:
+                vals[0] += row['total_cents']
             else:
-                chart_data_dict[month_label]['expenses'] += abs(t.amount)
+                vals[1] -= row['total_cents']
 
         chart_data = [
-            {"month": month, "income": float(vals['income']), "expenses": float(vals['expenses'])}
-            for month, vals in chart_data_dict.items()
+            {"month": month, "income": vals[0] / 100, "expenses": vals[1] / 100}
+            for month, vals in chart.items()
         ]
 
-        # Recent transactions
-        recent_qs = qs.order_by('-date', '-id')[:5]
-        recent_transactions = TransactionSerializer(recent_qs, many=True).data
-
-        return Response({
+        return {
             "summary": {
-                "total_income": float(income_total),
-                "total_expenses": float(expense_total_abs),
-                "balance": float(balance),
+                "total_income": income_cents / 100,
+                "total_expenses": expense_cents / 100,
+                "balance": balance_cents / 100,
             },
             "chart": chart_data,
-            "recent_transactions": recent_transactions,
-        })
+        }
 
 
 # ---------- Analytics ----------
@@ -326,75 +553,92 @@ class DashboardSummaryView(APIView):
 class AnalyticsOverviewView(APIView):
     permission_classes = [IsAuthenticated]
 
+    # Seconds to keep the overview; signals bust it on writes.
+    overview_cache_timeout = 60
+
     def get(self, request):
         user = request.user
-        qs = Transaction.objects.filter(user=user)
+        today = date.today()
 
-        # Spending by category (expenses only)
-        expenses = qs.filter(type='expense', category__isnull=False).values(
+        # Cached per user; the 30-day window also makes it per day
+        key = analytics_cache_key(user.id)
+        cached = cache.get(key)
+        if cached is not None and cached[0] == today:
+            return Response(cached[1])
+
+        overview = self.build_overview(Transaction.objects.for_user(user), today)
+        cache.set(key, (today, overview), self.overview_cache_timeout)
+        return Response(overview)
+
+    def build_overview(self, qs, today):
+        # Spending by category (expenses only). Expenses are stored negative,
+        # so the most negative sum is the biggest spend.
+        expenses = list(qs.filter(type=TxType.EXPENSE, category__isnull=False).values(
             'category__name'
         ).annotate(
-            total=Sum(Abs(F('amount')))
-        ).order_by('-total')
+            total_cents=Sum('amount_cents')
+        ).order_by('total_cents'))
 
         category_data = [
-            {"name": item['category__name'], "value": float(item['total'])}
+            {"name": item['category__name'], "value": -item['total_cents'] / 100}
             for item in expenses
         ]
 
-        # Simple monthly trend (net amount)
-        trend_dict = defaultdict(Decimal)
-        for t in qs:
-            month_label = t.date.strftime('%b')
-            # For trend: income positive, expenses negative
-            trend_dict[month_label] += t.amount
+        # Simple monthly trend (net amount), grouped in the database.
+        # For trend: income positive, expenses negative
+        monthly = qs.annotate(
+            y=ExtractYear('date'), mo=ExtractMonth('date'),
+        ).values('y', 'mo').annotate(
+            net_cents=Sum('amount_cents')
+        ).order_by('y', 'mo')
+
+        trend_dict = {}
+        for row in monthly:
+            month_label = MONTHS[row['mo'] - 1]
+            trend_dict[month_label] = trend_dict.get(month_label, 0) + row['net_cents']
 
         trend_data = [
-            {"month": month, "amount": float(amount)}
-            for month, amount in trend_dict.items()
+            {"month": month, "amount": cents / 100}
+            for month, cents in trend_dict.items()
         ]
 
-        # Average daily spending (last 30 days, expenses)
-        today = date.today()
+        # Income, expense and last-30-days expense totals in one pass
         last_30 = today.fromordinal(today.toordinal() - 30)
-        last_30_expenses = qs.filter(
-            type='expense',
-            date__gte=last_30,
-            date__lte=today
-        ).aggregate(
-            total=Sum(Abs(F('amount')))
-        )['total'] or Decimal('0')
+        totals = qs.aggregate(
+            income=Sum('amount_cents', filter=Q(type=TxType.INCOME), default=0),
+            expense=Sum('amount_cents', filter=Q(type=TxType.EXPENSE), default=0),
+            expense_30=Sum(
+                'amount_cents',
+                filter=Q(type=TxType.EXPENSE, date__gte=last_30, date__lte=today),
+                default=0,
+            ),
+        )
+        income_cents = totals['income']
+        # expenses are stored negative (tx_amount_sign)
+        expense_cents = -totals['expense']
 
-        avg_daily = last_30_expenses / Decimal('30')
+        # Average daily spending (last 30 days, expenses)
+        avg_daily = -totals['expense_30'] / 100 / 30
 
-        # Top category (by expense)
+        # Top category (by expense); percent from integer cents, one division
         top_category = category_data[0]['name'] if category_data else None
         top_category_percent = None
-        total_expenses_value = sum(c['value'] for c in category_data)
-        if total_expenses_value > 0 and category_data:
+        category_expense_cents = sum(item['total_cents'] for item in expenses)
+        if category_expense_cents < 0:
             top_category_percent = (
-                category_data[0]['value'] / total_expenses_value * 100.0
+                expenses[0]['total_cents'] / category_expense_cents * 100.0
             )
 
         # Savings rate (income minus expense / income)
-        income_total = qs.filter(type='income').aggregate(
-            total=Sum('amount')
-        )['total'] or Decimal('0')
-        expense_total = qs.filter(type='expense').aggregate(
-            total=Sum(Abs(F('amount')))
-        )['total'] or Decimal('0')
-
         savings_rate = None
-        if income_total > 0:
-            savings_rate = float(
-                (income_total - expense_total) / income_total * Decimal('100')
-            )
+        if income_cents > 0:
+            savings_rate = (income_cents - expense_cents) / income_cents * 100.0
 
-        return Response({
+        return {
             "category_data": category_data,
             "trend_data": trend_data,
-            "average_daily_spending": float(avg_daily),
+            "average_daily_spending": avg_daily,
             "top_category": top_category,
             "top_category_percent": top_category_percent,
             "savings_rate": savings_rate,
-        })
+        }